@@ -1,5 +1,7 @@
 from typing import List, Dict, TypedDict
 from datetime import datetime
+from collections import defaultdict
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from timestamp import timestamp, timestamp_filename
 # from time import sleep
@@ -7,28 +9,85 @@ from pathlib import Path
 # from random import uniform
 # from pathlib import Path
 from log import OperationLog, TransportLog
-from io import StringIO
 from machines import HumanPlateServer, TecanFluent480, OpentronsOT2, TecanInfinite200Pro, HumanStoreLabware
-from util import calculate_md5
 from lib_operator import Operator
 from storage_service import StorageService, get_storage
-from time import sleep
 from random import uniform
 # from lib_operator import Operator
 # from .operator import Operator
 import yaml
-import requests
+try:
+    from yaml import CSafeLoader as YAMLLoader
+except ImportError:
+    # libyamlが利用できない環境では純Python実装にフォールバック
+    from yaml import SafeLoader as YAMLLoader
+import asyncio
+import hashlib
+import httpx
 import random
 import os
 
 LOG_SERVER_URL = 'http://log_server:8000'
 
+# log_serverへの非同期HTTPクライアント（keep-aliveで接続を使い回す）
+# イベントループをブロックしないよう、log_serverへのリクエストはすべてこのクライアント経由で行う
+# 生成と破棄はアプリのライフサイクル（lifespan）に合わせる
+HTTP: httpx.AsyncClient | None = None
+
 # ストレージサービスの初期化（シングルトン）
 # 環境変数STORAGE_MODEで 's3' または 'local' を指定
 storage = get_storage()
 print(f"Storage service initialized: mode={storage.mode}")
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global HTTP
+    HTTP = httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=30.0
+    )
+    try:
+        yield
+    finally:
+        # アプリ終了時にlog_serverへの接続を閉じる
+        await HTTP.aclose()
+        HTTP = None
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+async def gather_all(*aws) -> list:
+    """
+    すべてのawaitableを並列に実行し、全件の完了を待ってから最初の例外を送出する
+
+    asyncio.gatherは最初の例外で即座に戻り、残りのタスクが未回収のまま実行され続けるため、
+    失敗時に例外を送出したい並列処理ではこの関数を使う。
+
+    Returns:
+        各awaitableの結果（引数の順）
+    """
+    results = await asyncio.gather(*aws, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+async def patch_attributes(url: str, attributes: Dict[str, str]) -> None:
+    """
+    log_serverのリソース（run/process/operation）の属性をまとめて更新
+
+    log_serverのPATCH APIは1リクエストにつき1属性（attribute/new_value）のみ受け付けるため、
+    属性の更新はすべてこの関数に集約し、呼び出し側では1回の呼び出しで済ませる。
+
+    Args:
+        url: 更新対象リソースのURL（例: {LOG_SERVER_URL}/api/operations/1）
+        attributes: 属性名と新しい値の辞書（挿入順に更新される）
+    """
+    for attribute, new_value in attributes.items():
+        await HTTP.patch(url=url, data={"attribute": attribute, "new_value": new_value})
 
 
 class Connection(TypedDict):
@@ -56,6 +115,7 @@ class Operation:
     run_storage_address: str  # Runのstorage_address（親パス）
     is_transport: bool
     is_data: bool
+    pending_updates: List[asyncio.Task]  # バックグラウンドで実行中のログ更新
 
     def __init__(
             self,
@@ -77,9 +137,10 @@ class Operation:
         self.run_storage_address = run_storage_address
         self.is_transport = is_transport
         self.is_data = is_data
+        self.pending_updates = []
 
-    def post(self):
-        response = requests.post(
+    async def post(self):
+        response = await HTTP.post(
             url=f'{LOG_SERVER_URL}/api/operations/',
             data={
                 "process_id": self.process_db_id,
@@ -109,36 +170,28 @@ class Operation:
         self.db_id = response_data["id"]
         # storage_addressを統一形式に変更: runs/{run_id}/operations/{op_id}/
         self.storage_address = f"{self.run_storage_address}operations/{self.db_id}/"
-        requests.patch(
+        await patch_attributes(
             url=f'{LOG_SERVER_URL}/api/operations/{self.db_id}',
-            data={
-                "attribute": "storage_address",
-                "new_value": self.storage_address
-            }
+            attributes={"storage_address": self.storage_address}
         )
 
-    def run(self):
+    async def run(self):
         self.started_at = datetime.now().isoformat()
         self.status = "running"
 
-        requests.patch(
-            url=f'{LOG_SERVER_URL}/api/operations/{self.db_id}',
-            data={
-                "attribute": "started_at",
-                "new_value": self.started_at
-            }
-        )
-        requests.patch(
+        # ログ更新は観測用のため、バックグラウンドで送信して実行をブロックしない
+        start_update = asyncio.create_task(patch_attributes(
             url=f'{LOG_SERVER_URL}/api/operations/{self.db_id}',
-            data={
-                "attribute": "status",
-                "new_value": self.status
+            attributes={
+                "started_at": self.started_at,
+                "status": self.status
             }
-        )
+        ))
+        self.pending_updates.append(start_update)
 
         # シミュレーション: ランダムな実行時間
         running_time = uniform(1, 3)
-        sleep(running_time)
+        await asyncio.sleep(running_time)
 
         self.finished_at = datetime.now().isoformat()
         self.status = "completed"
@@ -148,32 +201,37 @@ class Operation:
 
         # StorageServiceを使用してログを保存（S3またはローカル）
         log_path = f"{self.storage_address}log.txt"
-        storage.save(log_path, log_content.encode('utf-8'), content_type='text/plain')
-        print(f"Operation log saved: {log_path}")
+        # storage.saveは同期処理のため別スレッドで実行
+        self.pending_updates.append(asyncio.create_task(asyncio.to_thread(self._save_log, log_path, log_content)))
+
+        # statusが running -> completed の順に反映されるよう、開始時の更新完了を待ってから送信する
+        # （実行時間のsleep中に完了しているため、通常は待ち時間なし）
+        await start_update
 
         # DBにもログを保存（既存の動作を維持）
-        requests.patch(
+        self.pending_updates.append(asyncio.create_task(patch_attributes(
             url=f'{LOG_SERVER_URL}/api/operations/{self.db_id}',
-            data={
-                "attribute": "log",
-                "new_value": log_content
+            attributes={
+                "log": log_content,
+                "finished_at": self.finished_at,
+                "status": self.status
             }
-        )
+        )))
 
-        requests.patch(
-            url=f'{LOG_SERVER_URL}/api/operations/{self.db_id}',
-            data={
-                "attribute": "finished_at",
-                "new_value": self.finished_at
-            }
-        )
-        requests.patch(
-            url=f'{LOG_SERVER_URL}/api/operations/{self.db_id}',
-            data={
-                "attribute": "status",
-                "new_value": self.status
-            }
-        )
+    def _save_log(self, log_path: str, log_content: str):
+        storage.save(log_path, log_content.encode('utf-8'), content_type='text/plain')
+        print(f"Operation log saved: {log_path}")
+
+    async def wait_for_updates(self) -> List[BaseException]:
+        """
+        バックグラウンドで実行中のログ更新がすべて完了するまで待つ
+
+        Returns:
+            失敗したログ更新の例外リスト（すべて成功した場合は空）
+        """
+        results = await asyncio.gather(*self.pending_updates, return_exceptions=True)
+        self.pending_updates = []
+        return [result for result in results if isinstance(result, BaseException)]
 
 
 class Process:
@@ -191,8 +249,8 @@ class Process:
         self.storage_address = storage_address
         self.run_storage_address = run_storage_address
 
-    def post(self):
-        response = requests.post(
+    async def post(self):
+        response = await HTTP.post(
             url=f'{LOG_SERVER_URL}/api/processes/',
             data={
                 "name": self.id_in_protocol,
@@ -219,15 +277,12 @@ class Process:
         self.db_id = response_data["id"]
         # storage_addressを統一形式に変更: runs/{run_id}/processes/{process_id}/
         self.storage_address = f"{self.run_storage_address}processes/{self.db_id}/"
-        requests.patch(
+        await patch_attributes(
             url=f'{LOG_SERVER_URL}/api/processes/{self.db_id}',
-            data={
-                    "attribute": "storage_address",
-                    "new_value": self.storage_address
-            }
+            attributes={"storage_address": self.storage_address}
         )
 
-    def operation_mapping(self, machines: List[Operator]) -> Operation:
+    def operation_mapping(self, machines_by_type: Dict[str, List[Operator]]) -> Operation:
         if self.id_in_protocol in ["input", "output"]:
             operation = Operation(
                 process_db_id=self.db_id,
@@ -239,7 +294,7 @@ class Process:
                 run_storage_address=self.run_storage_address
             )
             return operation
-        suit_machine = random.choice([machine for machine in machines if machine.type == self.type])
+        suit_machine = random.choice(machines_by_type[self.type])
         operation = Operation(
             process_db_id=self.db_id,
             process_name=self.id_in_protocol,
@@ -260,10 +315,13 @@ def connection_to_operation(connection_list: List[Connection], process_list: Lis
         "output_content": connection['output'][1],
         "is_data": connection['is_data']
     } for connection in connection_list]
+    # 線形探索を避けるため事前に辞書化する（重複時は従来どおりリスト先頭の要素を優先）
+    process_by_id = {process.id_in_protocol: process for process in reversed(process_list)}
+    operation_name_by_process_name = {operation.process_name: operation.name for operation in reversed(operation_list)}
     operation_list_from_connection = []
     edge_list = []
     for connection in connections:
-        source_process = [process for process in process_list if process.id_in_protocol == connection['input_source']][0]
+        source_process = process_by_id[connection['input_source']]
         operation = Operation(
             process_db_id=source_process.db_id,
             process_name=source_process.id_in_protocol,
@@ -273,8 +331,8 @@ def connection_to_operation(connection_list: List[Connection], process_list: Lis
             is_data=connection["is_data"],
             run_storage_address=run_storage_address
         )
-        operation_name_from = [operation.name for operation in operation_list if operation.process_name == connection['input_source']][0]
-        operation_name_to = [operation.name for operation in operation_list if operation.process_name == connection['output_source']][0]
+        operation_name_from = operation_name_by_process_name[connection['input_source']]
+        operation_name_to = operation_name_by_process_name[connection['output_source']]
         if connection["is_data"]:
             edge_list.append({"from": operation_name_from, "to": operation_name_to})
         else:
@@ -285,7 +343,18 @@ def connection_to_operation(connection_list: List[Connection], process_list: Lis
     return operation_list_from_connection, edge_list
 
 
-def create_process_and_operation_and_edge(run_id, protocol_dict, machines, run_storage_address: str = ""):
+async def post_edge(run_id: int, edge: Dict[str, int]):
+    await HTTP.post(
+        url=f'{LOG_SERVER_URL}/api/edges/',
+        data={
+            "run_id": run_id,
+            "from_id": edge["from"],
+            "to_id": edge["to"]
+        }
+    )
+
+
+async def create_process_and_operation_and_edge(run_id, protocol_dict, machines, run_storage_address: str = ""):
     processes = protocol_dict["operations"]
     connections = protocol_dict["connections"]
 
@@ -315,88 +384,110 @@ def create_process_and_operation_and_edge(run_id, protocol_dict, machines, run_s
     )
 
     process_list += [input_process, output_process]
-    [process.post() for process in process_list]
-
-    operation_list = [process.operation_mapping(machines=machines) for process in process_list]
+    # 各POSTは互いに独立しているため、並列に送信する
+    await gather_all(*(process.post() for process in process_list))
+
+    # タイプごとのマシン一覧を一度だけ作成し、各processからはO(1)で参照する
+    machines_by_type = defaultdict(list)
+    for machine in machines:
+        machines_by_type[machine.type].append(machine)
+    operation_list = [process.operation_mapping(machines_by_type=machines_by_type) for process in process_list]
     operation_list_from_connection, edge_list = connection_to_operation(connections, process_list, operation_list, run_storage_address)
     operation_list += operation_list_from_connection
-    [operation.post() for operation in operation_list]
+    await gather_all(*(operation.post() for operation in operation_list))
 
+    # 同名のoperationが複数ある場合は従来どおりリスト先頭の要素を優先する
+    operation_db_id_by_name = {operation.name: operation.db_id for operation in reversed(operation_list)}
     edge_db_id_list = []
     for edge in edge_list:
-        operation_db_id_from = [operation.db_id for operation in operation_list if operation.name == edge["from"]][0]
-        operation_db_id_to = [operation.db_id for operation in operation_list if operation.name == edge["to"]][0]
+        operation_db_id_from = operation_db_id_by_name[edge["from"]]
+        operation_db_id_to = operation_db_id_by_name[edge["to"]]
         edge_db_id_list.append({
             "from": operation_db_id_from,
             "to": operation_db_id_to
         })
 
-    for edge in edge_db_id_list:
-        response = requests.post(
-            url=f'{LOG_SERVER_URL}/api/edges/',
-            data={
-                "run_id": run_id,
-                "from_id": edge["from"],
-                "to_id": edge["to"]
-            }
-        )
+    await gather_all(*(post_edge(run_id, edge) for edge in edge_db_id_list))
     return operation_list, edge_list
 
 
-def create_plan(connections: List[Dict[str, str]]) -> List[str]:
+def create_plan(connections: List[Dict[str, str]]) -> List[List[str]]:
     """
     Create a plan from a protocol yaml file using a topological sort
     :param protocol_yaml_path: path to the protocol yaml file
-    :return: a list of steps in the order they should
+    :return: a list of levels in the order they should run; steps in the same level are independent
     """
-    # make edge_list unique
-    # edge_list = list(set(connections))
-    edge_list = list(set([(connection['from'], connection['to']) for connection in connections]))
-    node_list = list(set([edge[0] for edge in edge_list] + [edge[1] for edge in edge_list]))
-    graph = {node: [] for node in node_list}
+    # make edge_list unique (edges and nodes are collected in a single pass)
+    edge_set = set()
+    node_set = set()
+    for connection in connections:
+        node_from, node_to = connection['from'], connection['to']
+        edge_set.add((node_from, node_to))
+        node_set.add(node_from)
+        node_set.add(node_to)
+    edge_list = list(edge_set)
+    node_list = list(node_set)
+
+    # ノード名を整数IDに変換し、隣接リストと入次数をリストで保持する
+    node_index = {node: i for i, node in enumerate(node_list)}
+    graph: List[List[int]] = [[] for _ in node_list]
+    indegree = [0] * len(node_list)
     for edge in edge_list:
-        graph[edge[0]].append(edge[1])
-
-    ret_list = []
-    seen = {node: False for node in graph.keys()}
-
-    def dfs(graph: Dict[str, str], node: str):
-        seen[node] = True
-        for child_node in graph[node]:
-            if seen[child_node]:
-                continue
-            dfs(graph, child_node)
-        ret_list.append(node)
-
-    [dfs(graph, node) for node in graph.keys() if not seen[node]]
-    ret_list.reverse()
-    return ret_list
-
+        graph[node_index[edge[0]]].append(node_index[edge[1]])
+        indegree[node_index[edge[1]]] += 1
+
+    # Kahnのアルゴリズム（再帰なし）
+    # その時点で入次数0のノードをまとめて1つのレベルとして出力する
+    # 同じマシンを複数回使うプロトコルでは、マシン名のノードに畳み込まれて閉路ができるため、
+    # 閉路上のノードも後続のレベルとして必ず出力する（従来のDFSと同様にすべてのノードを実行する）
+    initial_indegree = list(indegree)
+    visited = [False] * len(node_list)
+    level = [i for i, degree in enumerate(indegree) if degree == 0]
+    level_list = []
+    visited_count = 0
+    while visited_count < len(node_list):
+        if not level:
+            # 閉路で停止した場合: 未実行の親が最も少ないノードを1つだけ選んで閉路を切る
+            # （同じレベルのノード間に辺ができないよう、1ノードのみのレベルとする）
+            # 同数の場合は実行済みの親を持つノードを優先する
+            remaining = [i for i in range(len(node_list)) if not visited[i]]
+            level = [min(remaining, key=lambda i: (indegree[i], indegree[i] == initial_indegree[i]))]
+        level_list.append(level)
+        for node in level:
+            visited[node] = True
+        visited_count += len(level)
+        next_level = []
+        for node in level:
+            for child_node in graph[node]:
+                indegree[child_node] -= 1
+                if indegree[child_node] == 0 and not visited[child_node]:
+                    next_level.append(child_node)
+        level = next_level
+
+    return [[node_list[i] for i in level] for level in level_list]
+
+
+async def read_uploaded_yaml(yaml_file: UploadFile = File(...)) -> bytes:
+    """
+    アップロードされたYAMLファイルの内容を一度だけ読み取る
 
-async def read_uploaded_yaml(yaml_file: UploadFile = File(...)):
+    MD5計算・YAML解析・ストレージ保存はすべてこの戻り値を使い回す。
+    """
     if not yaml_file.filename.endswith(('.yaml', '.yml')):
         raise HTTPException(status_code=400, detail="Uploaded file must be a YAML file")
+    return await yaml_file.read()
+
+
+def parse_yaml(contents: bytes):
     try:
-        # ファイルの内容を読み取る
-        contents = await yaml_file.read()
-        contents_str = contents.decode('utf-8')
-        # yamlファイルを読み取る
-        yaml_data = yaml.safe_load(StringIO(contents_str))
-        return yaml_data
+        # yamlファイルを読み取る（bytesをそのまま渡し、libyamlのローダーで解析）
+        return yaml.load(contents, Loader=YAMLLoader)
     except yaml.YAMLError as e:
         raise HTTPException(status_code=400, detail=f"Invalid YAML format: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
 
-async def calc_md5_from_file(file: UploadFile = File(...)):
-    file_content_bytes = await file.read()  # bytesで取得
-    file_content_str = file_content_bytes.decode("utf-8")
-    md5 = calculate_md5(file_content_str)
-    await file.seek(0)
-    return md5
-
-
 def upload_file(content: bytes, path: str, content_type: str = 'text/plain') -> bool:
     """
     ファイルをストレージにアップロード（StorageService経由）
@@ -417,34 +508,16 @@ def upload_file(content: bytes, path: str, content_type: str = 'text/plain') ->
     return result
 
 
-async def upload_yaml_file(file: UploadFile, storage_address: str, filename: str) -> bool:
-    """
-    UploadFileからYAMLファイルをストレージにアップロード
-
-    Args:
-        file: アップロードされたファイル
-        storage_address: ストレージのベースパス（例: runs/1/）
-        filename: 保存するファイル名
-
-    Returns:
-        成功時True、失敗時False
-    """
-    await file.seek(0)
-    content = await file.read()
-    await file.seek(0)
-
-    path = f"{storage_address}{filename}"
-    return upload_file(content, path, content_type='application/x-yaml')
-
-
 @app.post("/run_experiment")
 async def run_experiment(project_id: int, protocol_name, user_id: int, protocol_yaml: UploadFile = File(...), manipulate_yaml: UploadFile = File(...)):
-    protocol_md5 = await calc_md5_from_file(protocol_yaml)
-    protocol = await read_uploaded_yaml(protocol_yaml)
-    manipulates = await read_uploaded_yaml(manipulate_yaml)
+    protocol_bytes = await read_uploaded_yaml(protocol_yaml)
+    manipulate_bytes = await read_uploaded_yaml(manipulate_yaml)
+    protocol_md5 = hashlib.md5(protocol_bytes).hexdigest()
+    protocol = parse_yaml(protocol_bytes)
+    manipulates = parse_yaml(manipulate_bytes)
 
     # 一旦空のstorage_addressでRun作成（run_id取得後に更新）
-    response = requests.post(
+    response = await HTTP.post(
         url=f'{LOG_SERVER_URL}/api/runs/',
         data={
             "project_id": project_id,
@@ -475,7 +548,7 @@ async def run_experiment(project_id: int, protocol_name, user_id: int, protocol_
     run_storage_address = f"runs/{run_id}/"
 
     # storage_addressを更新
-    update_response = requests.patch(
+    update_response = await HTTP.patch(
         url=f'{LOG_SERVER_URL}/api/runs/{run_id}',
         data={"attribute": "storage_address", "new_value": run_storage_address}
     )
@@ -483,7 +556,7 @@ async def run_experiment(project_id: int, protocol_name, user_id: int, protocol_
         print(f"Warning: Failed to update storage_address for run {run_id}: {update_response.text}")
 
     # storage_modeを更新（現在のストレージモードを記録）
-    update_mode_response = requests.patch(
+    update_mode_response = await HTTP.patch(
         url=f'{LOG_SERVER_URL}/api/runs/{run_id}',
         data={"attribute": "storage_mode", "new_value": storage.mode}
     )
@@ -492,18 +565,23 @@ async def run_experiment(project_id: int, protocol_name, user_id: int, protocol_
 
     # プロトコルファイルをストレージにアップロード（StorageService経由）
     print(f"Uploading YAML files to storage: {run_storage_address}")
-    await upload_yaml_file(protocol_yaml, run_storage_address, "protocol.yaml")
-    await upload_yaml_file(manipulate_yaml, run_storage_address, "manipulate.yaml")
+    # storage.saveは同期処理のため、イベントループをブロックしないよう別スレッドで実行
+    await gather_all(
+        asyncio.to_thread(upload_file, protocol_bytes, f"{run_storage_address}protocol.yaml", content_type='application/x-yaml'),
+        asyncio.to_thread(upload_file, manipulate_bytes, f"{run_storage_address}manipulate.yaml", content_type='application/x-yaml')
+    )
 
     # マシン初期化（storage_addressは動的生成された値を使用）
+    # manipulateは名前ごとに1つしかないことを想定している
+    manipulate_by_name = {manipulate['name']: manipulate for manipulate in manipulates}
     machines = [
-        HumanPlateServer("human_plate_server", manipulates, run_storage_address),
-        TecanFluent480("tecan_fluent_480", manipulates, run_storage_address),
-        OpentronsOT2("opentrons_ot2", manipulates, run_storage_address),
-        TecanInfinite200Pro("tecan_infinite_200_pro", manipulates, run_storage_address),
-        HumanStoreLabware("human_store_labware", manipulates, run_storage_address),
+        HumanPlateServer("human_plate_server", manipulate_by_name, run_storage_address),
+        TecanFluent480("tecan_fluent_480", manipulate_by_name, run_storage_address),
+        OpentronsOT2("opentrons_ot2", manipulate_by_name, run_storage_address),
+        TecanInfinite200Pro("tecan_infinite_200_pro", manipulate_by_name, run_storage_address),
+        HumanStoreLabware("human_store_labware", manipulate_by_name, run_storage_address),
     ]
-    operation_list, edge_list = create_process_and_operation_and_edge(
+    operation_list, edge_list = await create_process_and_operation_and_edge(
         run_id=run_id,
         protocol_dict=protocol,
         machines=machines,
@@ -511,13 +589,25 @@ async def run_experiment(project_id: int, protocol_name, user_id: int, protocol_
     )
     plan = create_plan(edge_list)
     run_start_time = datetime.now().isoformat()
-    requests.patch(url=f'{LOG_SERVER_URL}/api/runs/{run_id}', data={"attribute": "started_at", "new_value": run_start_time})
-    requests.patch(url=f'{LOG_SERVER_URL}/api/runs/{run_id}', data={"attribute": "status", "new_value": "running"})
-    for operation_name in plan:
-        operation = [operation for operation in operation_list if operation.name == operation_name][0]
-        operation.run()
+    await patch_attributes(url=f'{LOG_SERVER_URL}/api/runs/{run_id}', attributes={"started_at": run_start_time, "status": "running"})
+    operation_by_name = {operation.name: operation for operation in reversed(operation_list)}
+    try:
+        # 同じレベルのOperationは互いに独立しているため並列に実行する
+        for level in plan:
+            await gather_all(*(operation_by_name[operation_name].run() for operation_name in level))
+    finally:
+        # 失敗時も含め、各Operationのログ更新が完了するまで待つ（未回収のタスクを残さない）
+        update_errors = await asyncio.gather(
+            *(operation.wait_for_updates() for operation in operation_list),
+            return_exceptions=True
+        )
+    # Runを完了にする前に、各Operationのログ更新が反映されていることを保証する
+    for errors in update_errors:
+        if isinstance(errors, BaseException):
+            raise errors
+        if errors:
+            raise errors[0]
     run_finish_time = datetime.now().isoformat()
-    requests.patch(url=f'{LOG_SERVER_URL}/api/runs/{run_id}', data={"attribute": "finished_at", "new_value": run_finish_time})
-    requests.patch(url=f'{LOG_SERVER_URL}/api/runs/{run_id}', data={"attribute": "status", "new_value": "completed"})
+    await patch_attributes(url=f'{LOG_SERVER_URL}/api/runs/{run_id}', attributes={"finished_at": run_finish_time, "status": "completed"})
 
     return {"run_id": run_id, "storage_address": run_storage_address, "status": "completed"}
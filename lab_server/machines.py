@@ -2,34 +2,44 @@ from lib_operator import Operator
 
 
 class HumanPlateServer(Operator):
-    def __init__(self, id, manipulate_list, storage_address):
-        super().__init__(id, manipulate_list=manipulate_list, storage_address=storage_address, type="ServePlate96")
+    type = "ServePlate96"
+
+    def __init__(self, id, manipulate_by_name, storage_address):
+        super().__init__(id, manipulate=manipulate_by_name[self.type], storage_address=storage_address, type=self.type)
 
 
 class TecanFluent480(Operator):
-    def __init__(self, id, manipulate_list, storage_address):
-        super().__init__(id, manipulate_list=manipulate_list, storage_address=storage_address, type="DispenseLiquid96Wells")
+    type = "DispenseLiquid96Wells"
+
+    def __init__(self, id, manipulate_by_name, storage_address):
+        super().__init__(id, manipulate=manipulate_by_name[self.type], storage_address=storage_address, type=self.type)
 
 
 class OpentronsOT2(Operator):
-    def __init__(self, id, manipulate_list, storage_address):
-        super().__init__(id, manipulate_list=manipulate_list, storage_address=storage_address, type="DispenseLiquid96Wells")
+    type = "DispenseLiquid96Wells"
+
+    def __init__(self, id, manipulate_by_name, storage_address):
+        super().__init__(id, manipulate=manipulate_by_name[self.type], storage_address=storage_address, type=self.type)
 
 
 class TecanInfinite200Pro(Operator):
-    def __init__(self, id, manipulate_list, storage_address):
-        super().__init__(id, manipulate_list=manipulate_list, storage_address=storage_address, type="ReadAbsorbance3Colors")
+    type = "ReadAbsorbance3Colors"
+
+    def __init__(self, id, manipulate_by_name, storage_address):
+        super().__init__(id, manipulate=manipulate_by_name[self.type], storage_address=storage_address, type=self.type)
 
 
 class HumanStoreLabware(Operator):
-    def __init__(self, id, manipulate_list, storage_address):
-        super().__init__(id, manipulate_list=manipulate_list, storage_address=storage_address, type="StoreLabware")
+    type = "StoreLabware"
+
+    def __init__(self, id, manipulate_by_name, storage_address):
+        super().__init__(id, manipulate=manipulate_by_name[self.type], storage_address=storage_address, type=self.type)
 
 
 # machines = [
-#     HumanPlateServer("human_plate_server", manipulate_list),
-#     TecanFluent480("tecan_fluent_480", manipulate_list),
-#     OpentronsOT2("opentrons_ot2", manipulate_list),
-#     TecanInfinite200Pro("tecan_infinite_200_pro", manipulate_list),
-#     HumanStoreLabware("human_store_labware", manipulate_list),
+#     HumanPlateServer("human_plate_server", manipulate_by_name),
+#     TecanFluent480("tecan_fluent_480", manipulate_by_name),
+#     OpentronsOT2("opentrons_ot2", manipulate_by_name),
+#     TecanInfinite200Pro("tecan_infinite_200_pro", manipulate_by_name),
+#     HumanStoreLabware("human_store_labware", manipulate_by_name),
 # ]
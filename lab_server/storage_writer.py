@@ -15,14 +15,26 @@ Read + 管理機能はlabcode-log-serverが担当。
     writer.save_json("runs/1/metadata.json", {"key": "value"})
 """
 
+import io
 import os
-import json
 import logging
+import threading
 from pathlib import Path
 from typing import Optional
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# S3マルチパートアップロード設定
+# 閾値未満の小さなファイルはput_objectで1回のリクエストとして送信する
+S3_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+S3_MULTIPART_CHUNKSIZE = 16 * 1024 * 1024
+S3_MAX_CONCURRENCY = 10
+
+# S3クライアントのコネクションプールサイズ（botocoreのデフォルトは10）
+S3_MAX_POOL_CONNECTIONS = 50
+
 
 class StorageWriter:
     """軽量ストレージライター（Write専用）"""
@@ -51,6 +63,8 @@ class StorageWriter:
     def _init_s3(self):
         """S3バックエンドを初期化"""
         import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
 
         client_kwargs = {
             'aws_access_key_id': os.getenv('AWS_ACCESS_KEY_ID'),
@@ -62,8 +76,20 @@ class StorageWriter:
         if endpoint_url:
             client_kwargs['endpoint_url'] = endpoint_url
 
-        self._s3_client = boto3.client('s3', **client_kwargs)
+        # 全リクエストで共有するクライアントのため、コネクションプールを広げてkeep-aliveを有効にする
+        client_config = Config(
+            max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+            retries={'max_attempts': 5, 'mode': 'adaptive'},
+            tcp_keepalive=True
+        )
+        self._s3_client = boto3.client('s3', config=client_config, **client_kwargs)
         self._bucket_name = os.getenv('S3_BUCKET_NAME', 'labcode-dev-artifacts')
+        self._transfer_config = TransferConfig(
+            multipart_threshold=S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=S3_MAX_CONCURRENCY,
+            use_threads=True
+        )
 
     def _init_local(self):
         """ローカルバックエンドを初期化"""
@@ -96,12 +122,22 @@ class StorageWriter:
     def _save_s3(self, path: str, content: bytes, content_type: str) -> bool:
         """S3に保存"""
         try:
-            self._s3_client.put_object(
-                Bucket=self._bucket_name,
-                Key=path,
-                Body=content,
-                ContentType=content_type
-            )
+            if len(content) >= S3_MULTIPART_THRESHOLD:
+                # 大きなファイルはマルチパートで並列アップロード
+                self._s3_client.upload_fileobj(
+                    io.BytesIO(content),
+                    self._bucket_name,
+                    path,
+                    ExtraArgs={'ContentType': content_type},
+                    Config=self._transfer_config
+                )
+            else:
+                self._s3_client.put_object(
+                    Bucket=self._bucket_name,
+                    Key=path,
+                    Body=content,
+                    ContentType=content_type
+                )
             logger.debug(f"S3 upload success: {path}")
             return True
         except Exception as e:
@@ -113,8 +149,14 @@ class StorageWriter:
         try:
             full_path = self._base_path / path
             full_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(full_path, 'wb') as f:
-                f.write(content)
+            # 1回きりの書き込みのため、バッファリング層を介さずに直接書き込む
+            fd = os.open(full_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+            try:
+                view = memoryview(content)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
             logger.debug(f"Local save success: {path}")
             return True
         except Exception as e:
@@ -135,31 +177,34 @@ class StorageWriter:
         """
         return self.save(path, text.encode(encoding), content_type='text/plain')
 
-    def save_json(self, path: str, data: dict, indent: int = 2) -> bool:
+    def save_json(self, path: str, data: dict) -> bool:
         """
         JSONファイルを保存
 
         Args:
             path: 保存先パス
-            data: 辞書データ
-            indent: インデント幅
+            data: 辞書データ（インデント幅2で出力）
 
         Returns:
             bool: 成功時True
         """
-        content = json.dumps(data, ensure_ascii=False, indent=indent)
-        return self.save(path, content.encode('utf-8'), content_type='application/json')
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return self.save(path, content, content_type='application/json')
 
 
 # シングルトンインスタンス
 _writer_instance: Optional[StorageWriter] = None
+_writer_lock = threading.Lock()
 
 
 def get_storage_writer() -> StorageWriter:
-    """StorageWriterのシングルトンインスタンスを取得"""
+    """StorageWriterのシングルトンインスタンスを取得（スレッドセーフ）"""
     global _writer_instance
     if _writer_instance is None:
-        _writer_instance = StorageWriter()
+        with _writer_lock:
+            # ロック待ちの間に他スレッドが生成している可能性があるため再確認
+            if _writer_instance is None:
+                _writer_instance = StorageWriter()
     return _writer_instance
 
 
@@ -0,0 +1,104 @@
+import os
+import random
+import tempfile
+
+os.environ.setdefault('STORAGE_MODE', 'local')
+os.environ.setdefault('LOCAL_STORAGE_PATH', tempfile.mkdtemp())
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import lab_server  # noqa: E402
+from lab_server import app, create_plan  # noqa: E402
+
+
+def flatten(plan):
+    return [node for level in plan for node in level]
+
+
+def test_create_plan_orders_steps_topologically():
+    edges = [
+        {"from": "input", "to": "serve"},
+        {"from": "serve", "to": "dispense"},
+        {"from": "input", "to": "dispense"},
+        {"from": "dispense", "to": "output"},
+    ]
+    assert create_plan(edges) == [["input"], ["serve"], ["dispense"], ["output"]]
+
+
+def test_create_plan_with_repeated_machine():
+    # 2つの読み取り工程が同じマシン（tecan_infinite_200_pro）に割り当てられ、閉路ができるケース
+    edges = [
+        {"from": "serve", "to": "T1"},
+        {"from": "T1", "to": "disp"},
+        {"from": "disp", "to": "T2"},
+        {"from": "T2", "to": "tecan_infinite_200_pro"},
+        {"from": "tecan_infinite_200_pro", "to": "T3"},
+        {"from": "T3", "to": "disp2"},
+        {"from": "disp2", "to": "T4"},
+        {"from": "T4", "to": "tecan_infinite_200_pro"},
+    ]
+    assert flatten(create_plan(edges)) == [
+        "serve", "T1", "disp", "T2", "tecan_infinite_200_pro", "T3", "disp2", "T4"
+    ]
+
+
+def test_create_plan_emits_cycle_nodes_as_trailing_levels():
+    edges = [
+        {"from": "input", "to": "serve"},
+        {"from": "input", "to": "dispense"},
+        {"from": "serve", "to": "read"},
+        {"from": "dispense", "to": "read"},
+        {"from": "read", "to": "store"},
+        {"from": "store", "to": "read"},
+    ]
+    plan = create_plan(edges)
+    assert plan[0] == ["input"]
+    assert sorted(plan[1]) == ["dispense", "serve"]
+    # 閉路上のノードも実行されずに残ることはない
+    assert plan[2:] == [["read"], ["store"]]
+    assert sorted(flatten(plan)) == sorted({node for edge in edges for node in edge.values()})
+
+
+def assert_levels_independent(plan, edges):
+    level_of = {node: i for i, level in enumerate(plan) for node in level}
+    for edge in edges:
+        assert level_of[edge["from"]] != level_of[edge["to"]], edge
+
+
+def test_create_plan_keeps_levels_independent_on_cycles():
+    # 2つのマシン（ot2, tecan）がそれぞれ2回使われ、閉路が重なるケース
+    edges = [
+        {"from": "hps", "to": "T1"},
+        {"from": "T1", "to": "ot2"},
+        {"from": "hps", "to": "Tx"},
+        {"from": "Tx", "to": "tecan"},
+        {"from": "ot2", "to": "T2"},
+        {"from": "T2", "to": "tecan"},
+        {"from": "tecan", "to": "T3"},
+        {"from": "T3", "to": "ot2"},
+        {"from": "ot2", "to": "tecan"},
+    ]
+    plan = create_plan(edges)
+    assert_levels_independent(plan, edges)
+    assert sorted(flatten(plan)) == ["T1", "T2", "T3", "Tx", "hps", "ot2", "tecan"]
+
+    rng = random.Random(0)
+    for _ in range(500):
+        nodes = [f"n{i}" for i in range(rng.randint(2, 8))]
+        edges = [
+            {"from": rng.choice(nodes), "to": rng.choice(nodes)}
+            for _ in range(rng.randint(1, 16))
+        ]
+        edges = [edge for edge in edges if edge["from"] != edge["to"]]
+        plan = create_plan(edges)
+        assert_levels_independent(plan, edges)
+        assert sorted(flatten(plan)) == sorted({node for edge in edges for node in edge.values()})
+
+
+def test_http_client_follows_app_lifespan():
+    # 同一プロセスでアプリを複数回起動しても、閉じたクライアントを使い回さない
+    for _ in range(2):
+        with TestClient(app):
+            assert lab_server.HTTP is not None
+            assert not lab_server.HTTP.is_closed
+        assert lab_server.HTTP is None